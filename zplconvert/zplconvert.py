@@ -1,31 +1,66 @@
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-from PIL import Image, ImageTk, ImageOps
+from PIL import Image, ImageTk
 import os
 import subprocess
 import sys
-import io
+import binascii
+import concurrent.futures
+import logging
 import fitz  # PyMuPDF
+import numpy as np
 
+log = logging.getLogger(__name__)
 
-def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
+# Resolution used to locate the label on letter-size pages; only the
+# located label region is then rendered at the target DPI
+SCOUT_DPI = 75
+
+
+def _render_page(page, dpi, clip=None, colorspace=fitz.csRGB):
+    """
+    Render a PDF page, or the clip rectangle of it, to a PIL Image.
+    """
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    pix = page.get_pixmap(matrix=mat, clip=clip, colorspace=colorspace)
+    # Build the image straight from the raw samples, no PPM round-trip
+    mode = ("L", "LA", "RGB", "RGBA")[pix.n - 1]
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+
+
+def extract_label_from_pdf(pdf_path, target_dpi=203, debug=False):
     """
     Extract a shipping label from a PDF that may be:
     - Letter size with label on one side
     - Rotated 90 or 270 degrees
     - Already the correct 4x6 size
 
+    pdf_path is a path, or an already open fitz.Document which is left
+    open for the caller. Analysis details are logged to this module's
+    logger at DEBUG level; enable it to see them. The debug argument is
+    accepted for compatibility only and has no effect.
+
     Returns a PIL Image of the normalized label.
     """
+    if isinstance(pdf_path, fitz.Document):
+        return _extract_label_from_page(pdf_path[0], target_dpi)
+
     doc = fitz.open(pdf_path)
-    page = doc[0]
+    try:
+        return _extract_label_from_page(doc[0], target_dpi)
+    finally:
+        doc.close()
+
 
+def _extract_label_from_page(page, target_dpi):
+    """
+    Extract the label from a single PDF page, see extract_label_from_pdf.
+    """
     # Get page dimensions in inches
     page_width_in = page.rect.width / 72
     page_height_in = page.rect.height / 72
 
-    if debug:
-        print(f"PDF page size: {page_width_in:.2f} x {page_height_in:.2f} inches")
+    log.debug("PDF page size: %.2f x %.2f inches", page_width_in, page_height_in)
 
     # Check if this is approximately letter size (8.5 x 11)
     is_letter_size = (
@@ -33,43 +68,40 @@ def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
         (10 < page_width_in < 12 and 7.5 < page_height_in < 9.5)
     )
 
-    if debug:
-        print(f"Is letter size: {is_letter_size}")
-
-    # Render at target DPI
-    mat = fitz.Matrix(target_dpi / 72, target_dpi / 72)
-    pix = page.get_pixmap(matrix=mat)
-    img_data = pix.tobytes("ppm")
-    img = Image.open(io.BytesIO(img_data))
-
-    doc.close()
+    log.debug("Is letter size: %s", is_letter_size)
 
     if not is_letter_size:
-        # Assume it's already the right size, just return it
-        return img
+        # Assume it's already the right size, just render and return it
+        return _render_page(page, target_dpi)
 
-    # For letter size, find the actual label content
-    # Convert to grayscale for analysis
-    gray = img.convert('L')
+    # For letter size, find the actual label content on a cheap low-DPI
+    # grayscale render, then re-render only the label region at the target DPI
+    img = _render_page(page, SCOUT_DPI, colorspace=fitz.csGRAY)
 
     # Use a stricter threshold to find actual printed content (not light artifacts)
     threshold = 240
-    def threshold_fn(x):
-        return 0 if x < threshold else 255
-
-    binary = gray.point(threshold_fn, mode='L')
-
-    # Find bounding box of dark content
-    bbox = ImageOps.invert(binary).getbbox()
+    dark = np.asarray(img) < threshold
+
+    # Find bounding box of dark content from the row and column projections,
+    # keeping the column counts for the density analysis below
+    col_counts = dark.sum(axis=0)
+    dark_cols = np.flatnonzero(col_counts)
+    dark_rows = np.flatnonzero(dark.any(axis=1))
+    bbox = None
+    if dark_cols.size:
+        bbox = (
+            int(dark_cols[0]),
+            int(dark_rows[0]),
+            int(dark_cols[-1]) + 1,
+            int(dark_rows[-1]) + 1,
+        )
 
     if bbox is None:
-        if debug:
-            print("No content bounding box found, returning original")
-        return img
+        log.debug("No content bounding box found, returning original")
+        return _render_page(page, target_dpi)
 
-    if debug:
-        print(f"Initial content bbox: {bbox}")
-        print(f"Original image size: {img.size}")
+    log.debug("Initial content bbox: %s", bbox)
+    log.debug("Scout image size: %s", img.size)
 
     # Check if bbox covers the whole page (common issue with PDFs that have invisible elements)
     bbox_covers_page = (
@@ -80,61 +112,50 @@ def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
     )
 
     if bbox_covers_page:
-        if debug:
-            print("Bbox covers whole page - using column density analysis")
+        log.debug("Bbox covers whole page - using column density analysis")
 
-        # Analyze vertical strips to find where the label actually is
+        # Analyze column density to find where the label actually is
         # Shipping labels are typically on the left or right half
-        strip_width = img.width // 20
-        strip_densities = []
-
-        for i in range(20):
-            strip_left = i * strip_width
-            strip_right = (i + 1) * strip_width
-            strip = binary.crop((strip_left, 0, strip_right, img.height))
-            # Count dark pixels (0 = dark in our binary)
-            dark_pixels = sum(1 for p in strip.getdata() if p == 0)
-            density = dark_pixels / (strip_width * img.height)
-            strip_densities.append((i, density))
-
-        if debug:
-            print(f"Strip densities: {[(i, f'{d:.3f}') for i, d in strip_densities]}")
-
-        # Find contiguous region with high density (the label)
+        margin = img.width // 20
+
+        # Find contiguous runs of high density columns (the label)
         # Label typically has >5% density, empty area <1%
-        label_strips = [i for i, d in strip_densities if d > 0.02]
+        dense = np.concatenate(([0], (col_counts > 0.02 * img.height).view(np.int8), [0]))
+        runs = []
+        for start, stop in np.flatnonzero(np.diff(dense)).reshape(-1, 2).tolist():
+            # Bridge narrow gaps, e.g. blank columns between blocks of text
+            if runs and start - runs[-1][1] < margin:
+                runs[-1][1] = stop
+            else:
+                runs.append([start, stop])
 
-        if label_strips:
-            left_strip = min(label_strips)
-            right_strip = max(label_strips)
+        log.debug("Dense column runs: %s", runs)
 
-            # Convert back to pixel coordinates with some margin
-            margin = strip_width
-            left = max(0, left_strip * strip_width - margin)
-            right = min(img.width, (right_strip + 1) * strip_width + margin)
+        if runs:
+            # Keep the run holding the most dark pixels
+            label_start, label_stop = max(runs, key=lambda run: col_counts[run[0]:run[1]].sum())
+
+            # Add some margin around the run
+            left = max(0, label_start - margin)
+            right = min(img.width, label_stop + margin)
 
             # Now find vertical bounds within this horizontal region
-            cropped_region = binary.crop((left, 0, right, img.height))
-            inverted_region = ImageOps.invert(cropped_region)
-            region_bbox = inverted_region.getbbox()
+            dark_rows = np.flatnonzero(dark[:, left:right].any(axis=1))
 
-            if region_bbox:
-                top = max(0, region_bbox[1] - margin)
-                bottom = min(img.height, region_bbox[3] + margin)
+            if dark_rows.size:
+                top = max(0, int(dark_rows[0]) - margin)
+                bottom = min(img.height, int(dark_rows[-1]) + 1 + margin)
                 bbox = (left, top, right, bottom)
 
-                if debug:
-                    print(f"Refined bbox from density analysis: {bbox}")
+                log.debug("Refined bbox from density analysis: %s", bbox)
 
-    if debug:
-        print(f"Final content bbox: {bbox}")
+    log.debug("Final content bbox: %s", bbox)
 
     # Calculate the content dimensions in inches
-    content_width_in = (bbox[2] - bbox[0]) / target_dpi
-    content_height_in = (bbox[3] - bbox[1]) / target_dpi
+    content_width_in = (bbox[2] - bbox[0]) / SCOUT_DPI
+    content_height_in = (bbox[3] - bbox[1]) / SCOUT_DPI
 
-    if debug:
-        print(f"Content size in inches: {content_width_in:.2f} x {content_height_in:.2f}")
+    log.debug("Content size in inches: %.2f x %.2f", content_width_in, content_height_in)
 
     # Determine the expected label size based on content dimensions
     # Standard sizes: 4x6, 4x2, etc. - find the best fit
@@ -161,31 +182,36 @@ def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
         label_long_edge = max_content_dim + 0.2
         label_short_edge = min_content_dim + 0.2
 
-    if debug:
-        print(f"Detected label size: {label_short_edge} x {label_long_edge} inches")
+    log.debug("Detected label size: %s x %s inches", label_short_edge, label_long_edge)
 
-    # Calculate crop region centered on the content bbox but sized for full label
-    content_center_x = (bbox[0] + bbox[2]) / 2
-    content_center_y = (bbox[1] + bbox[3]) / 2
+    # Calculate crop region centered on the content bbox but sized for full label.
+    # Work in target DPI pixels so a standard label keeps the printer's exact
+    # dot size (e.g. 812 x 1218 for 4x6) once the clip is rendered
+    zoom = target_dpi / 72
+    page_px = (page.rect * fitz.Matrix(zoom, zoom)).irect
+    to_target = target_dpi / SCOUT_DPI
+    content_center_x = (bbox[0] + bbox[2]) / 2 * to_target
+    content_center_y = (bbox[1] + bbox[3]) / 2 * to_target
 
     # The label is rotated, so long edge is horizontal on the page
-    crop_half_width = (label_long_edge * target_dpi) / 2
-    crop_half_height = (label_short_edge * target_dpi) / 2
+    crop_width = min(page_px.width, int(label_long_edge * target_dpi))
+    crop_height = min(page_px.height, int(label_short_edge * target_dpi))
 
-    left = int(max(0, content_center_x - crop_half_width))
-    right = int(min(img.width, content_center_x + crop_half_width))
-    top = int(max(0, content_center_y - crop_half_height))
-    bottom = int(min(img.height, content_center_y + crop_half_height))
+    # Shift, rather than shrink, a crop that would run off the page
+    left = int(min(max(0, content_center_x - crop_width / 2), page_px.width - crop_width))
+    top = int(min(max(0, content_center_y - crop_height / 2), page_px.height - crop_height))
+    right = left + crop_width
+    bottom = top + crop_height
 
-    if debug:
-        print(f"Crop region for full label: ({left}, {top}, {right}, {bottom})")
-        print(f"Crop size: {right - left} x {bottom - top} pixels")
+    log.debug("Crop region for full label: (%d, %d, %d, %d)", left, top, right, bottom)
+    log.debug("Crop size: %d x %d pixels", right - left, bottom - top)
 
-    # Crop to content
-    cropped = img.crop((left, top, right, bottom))
+    # Re-render only the label region at the target DPI, with the clip on
+    # whole target pixels so MuPDF has nothing to round outward
+    clip = fitz.Rect(left / zoom, top / zoom, right / zoom, bottom / zoom)
+    cropped = _render_page(page, target_dpi, clip=clip)
 
-    if debug:
-        print(f"Cropped size: {cropped.size}")
+    log.debug("Cropped size: %s", cropped.size)
 
     # Determine if rotation is needed based on:
     # 1. The cropped dimensions compared to standard 4x6 label
@@ -202,10 +228,9 @@ def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
     page_height = img.height
     spans_page_height = content_height > (page_height * 0.7)
 
-    if debug:
-        print(f"Aspect ratio: {aspect_ratio:.2f} (standard 4x6 is {standard_label_ratio:.2f})")
-        print(f"Content spans {content_height/page_height*100:.0f}% of page height")
-        print(f"Spans most of page height: {spans_page_height}")
+    log.debug("Aspect ratio: %.2f (standard 4x6 is %.2f)", aspect_ratio, standard_label_ratio)
+    log.debug("Content spans %.0f%% of page height", content_height / page_height * 100)
+    log.debug("Spans most of page height: %s", spans_page_height)
 
     # Rotation logic:
     # - If content is landscape (wider than tall), rotate
@@ -215,25 +240,21 @@ def extract_label_from_pdf(pdf_path, target_dpi=203, debug=True):
     if aspect_ratio > 1.0:
         # Clearly landscape - needs rotation
         needs_rotation = True
-        if debug:
-            print("Landscape orientation detected")
+        log.debug("Landscape orientation detected")
     elif spans_page_height and aspect_ratio > 0.5:
         # Content is tall (spans page) but aspect ratio suggests it's rotated
         # A 4x6 label rotated 90° on letter paper would be ~6" tall and ~4" wide
         # which gives aspect ratio of ~0.67, but on letter it spans ~6/11 = 55% height
         # This eBay label spans most of the height, so it's rotated
         needs_rotation = True
-        if debug:
-            print("Tall content spanning page height - likely rotated label")
+        log.debug("Tall content spanning page height - likely rotated label")
 
     if needs_rotation:
-        if debug:
-            print("Rotating 90 degrees counter-clockwise")
+        log.debug("Rotating 90 degrees counter-clockwise")
         # Rotate 90° counter-clockwise for labels with text reading bottom-to-top
         cropped = cropped.rotate(90, expand=True)
 
-    if debug:
-        print(f"Final size: {cropped.size}")
+    log.debug("Final size: %s", cropped.size)
 
     return cropped
 
@@ -247,6 +268,10 @@ class ZPLPrinterApp:
         
         self.image_path = None
         self.pil_image = None
+        self._zpl_cache = {}
+        self._render_cache = {}
+        # A single worker serializes renders, PyMuPDF is not thread-safe
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
         # Default printer name
         self.printer_name = "Zebra_Technologies_ZTC_GX420d_2"
@@ -275,6 +300,8 @@ class ZPLPrinterApp:
         
         self.preview_label = ttk.Label(preview_frame, text="No image selected")
         self.preview_label.pack(padx=10, pady=10, fill="both")
+        self.preview_photo = None
+        self._preview_mode = None
         
         # Settings frame
         settings_frame = ttk.LabelFrame(self.root, text="Print Settings")
@@ -378,142 +405,205 @@ class ZPLPrinterApp:
         )
         
         if file_path:
+            # Drop renders of the previous file (or a stale copy of this one)
+            self._render_cache.clear()
             self.image_path = file_path
             self.file_label.config(text=os.path.basename(file_path))
             self.load_preview()
-            self.print_button.config(state="normal")
-            self.status_var.set(f"Selected: {os.path.basename(file_path)}")
 
     def on_extract_toggle(self):
         """Reload preview when extract option is toggled."""
         if self.image_path:
             self.load_preview()
 
+    def set_loading(self, loading):
+        """Disable the controls that start a render or print while one is pending."""
+        state = "disabled" if loading else "normal"
+        self.browse_button.config(state=state)
+        self.extract_label_check.config(state=state)
+        if loading or self.pil_image is None:
+            self.print_button.config(state="disabled")
+        else:
+            self.print_button.config(state="normal")
+
     def load_preview(self):
-        try:
-            # Check if the file is a PDF
-            if self.image_path.lower().endswith('.pdf'):
-                pdf_document = fitz.open(self.image_path)
+        self._zpl_cache.clear()
+
+        # Reuse an earlier render of the same file and extract setting
+        key = (self.image_path, self.extract_label_var.get(), 203)
+        if key in self._render_cache:
+            self.pil_image, preview_image, status = self._render_cache[key]
+            self.show_preview(preview_image, status)
+            # Re-enable Print, which a failed render of another key may have left off
+            self.set_loading(False)
+            return
+
+        # Render on a worker thread so the UI stays responsive, then hand
+        # the result back to the Tk main loop. Drop the previous image so a
+        # failed render cannot leave it printable under the new file name
+        self.pil_image = None
+        self.set_loading(True)
+        self.status_var.set(f"Loading: {os.path.basename(self.image_path)}")
+        future = self._executor.submit(self.render_preview, self.image_path, key[1])
+        future.add_done_callback(lambda f: self.root.after(0, self.on_preview_ready, key, f))
+
+    def render_preview(self, image_path, extract_label):
+        """
+        Load the image to print and its preview thumbnail.
+
+        Runs on a worker thread, so must not touch any Tk state.
+        """
+        status = None
+
+        # Check if the file is a PDF
+        if image_path.lower().endswith('.pdf'):
+            # Open the PDF once and share it between the checks and the render
+            pdf_document = fitz.open(image_path)
+            try:
                 if len(pdf_document) == 0:
                     raise ValueError("PDF file is empty")
                 page_count = len(pdf_document)
-                pdf_document.close()
 
-                if self.extract_label_var.get():
+                if extract_label:
                     # Use the smart extraction function
-                    self.pil_image = extract_label_from_pdf(self.image_path, target_dpi=203)
+                    pil_image = extract_label_from_pdf(pdf_document, target_dpi=203)
                     # Show info about extraction
                     if page_count > 1:
-                        self.status_var.set(f"PDF has {page_count} pages - extracted label from page 1")
+                        status = f"PDF has {page_count} pages - extracted label from page 1"
                     else:
-                        self.status_var.set(f"Label extracted: {self.pil_image.size[0]}x{self.pil_image.size[1]} px")
+                        status = f"Label extracted: {pil_image.size[0]}x{pil_image.size[1]} px"
                 else:
                     # Render PDF without extraction (original behavior)
-                    pdf_document = fitz.open(self.image_path)
-                    page = pdf_document[0]
-                    mat = fitz.Matrix(203/72, 203/72)
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("ppm")
-                    self.pil_image = Image.open(io.BytesIO(img_data))
-                    pdf_document.close()
+                    pil_image = _render_page(pdf_document[0], 203)
                     if page_count > 1:
-                        self.status_var.set(f"PDF has {page_count} pages - using page 1")
-            else:
-                # Open the image normally
-                self.pil_image = Image.open(self.image_path)
+                        status = f"PDF has {page_count} pages - using page 1"
+            finally:
+                pdf_document.close()
+        else:
+            # Open the image normally, decoding it here rather than on first use
+            pil_image = Image.open(image_path)
+            pil_image.load()
 
-            # Get the preview frame size
-            preview_width = 480  # Slightly less than the frame width to account for padding
-            preview_height = 280  # Slightly less than the frame height to account for padding
+        # Get the preview frame size
+        preview_width = 480  # Slightly less than the frame width to account for padding
+        preview_height = 280  # Slightly less than the frame height to account for padding
 
-            # Calculate aspect ratio
-            width, height = self.pil_image.size
-            ratio = min(preview_width / width, preview_height / height)
-            new_size = (int(width * ratio), int(height * ratio))
+        # Calculate aspect ratio
+        width, height = pil_image.size
+        ratio = min(preview_width / width, preview_height / height)
+        new_size = (int(width * ratio), int(height * ratio))
 
-            preview_image = self.pil_image.copy()
-            preview_image.thumbnail(new_size, Image.LANCZOS)
+        preview_image = pil_image.copy()
+        # Box-reduce close to the final size first, then a cheap bilinear pass
+        preview_image.thumbnail(new_size, Image.BILINEAR, reducing_gap=3.0)
 
-            # Convert to PhotoImage for display
-            tk_image = ImageTk.PhotoImage(preview_image)
+        return pil_image, preview_image, status
 
-            # Update the preview label
-            self.preview_label.config(image=tk_image)
-            self.preview_label.image = tk_image  # Keep a reference to prevent garbage collection
+    def on_preview_ready(self, key, future):
+        """Show a finished background render, called on the Tk main loop."""
+        try:
+            pil_image, preview_image, status = future.result()
+
+            self.pil_image = pil_image
+            self._render_cache[key] = (pil_image, preview_image, status)
+            self.show_preview(preview_image, status)
 
         except Exception as e:
             self.status_var.set(f"Error loading image: {e}")
             messagebox.showerror("Error", f"Failed to load image: {e}")
+
+        finally:
+            self.set_loading(False)
+
+    def show_preview(self, preview_image, status):
+        # Paste into the existing PhotoImage when size and mode allow, so Tk
+        # reuses its image instead of allocating a new one per refresh
+        # (paste converts to the photo's mode, so a mode change needs a new one)
+        photo = self.preview_photo
+        if (photo is None or self._preview_mode != preview_image.mode or
+                (photo.width(), photo.height()) != preview_image.size):
+            # Keep a reference on self to prevent garbage collection
+            self.preview_photo = ImageTk.PhotoImage(preview_image)
+            self._preview_mode = preview_image.mode
+            self.preview_label.config(image=self.preview_photo)
+        else:
+            photo.paste(preview_image)
+        self.status_var.set(status or f"Selected: {os.path.basename(self.image_path)}")
+    
+    def get_graphic_data(self, threshold):
+        """Convert the loaded image to ^GFA hex data, cached per image and threshold."""
+        key = (id(self.pil_image), threshold)
+        if key in self._zpl_cache:
+            return self._zpl_cache[key]
+        
+        # Convert to black and white with threshold (set bits print black in ZPL)
+        gray = np.asarray(self.pil_image.convert('L'))
+        packed = np.packbits(gray < threshold, axis=1)
+        
+        # Get dimensions
+        height, width = gray.shape
+        
+        # Bytes per row (packbits pads each row to a whole byte)
+        bytes_per_row = packed.shape[1]
+        
+        # Get the binary data
+        binary_data = packed.tobytes()
+        
+        # Convert binary data to hex, one row per line
+        hex_all = binascii.hexlify(binary_data).decode('ascii').upper()
+        row_len = bytes_per_row * 2
+        hex_data = '\n'.join(hex_all[i:i+row_len] for i in range(0, len(hex_all), row_len))
+        
+        # Calculate total bytes
+        total_bytes = bytes_per_row * height
+        
+        result = (hex_data, width, height, bytes_per_row, total_bytes)
+        self._zpl_cache[key] = result
+        return result
     
     def print_image(self):
         if not self.image_path:
             return
         
         try:
-            # Get settings from UI as integers
-            threshold = int(self.threshold_var.get())
-            position_x = int(self.pos_x_var.get())
-            position_y = int(self.pos_y_var.get())
-            print_speed = int(self.speed_var.get())
-            darkness = int(self.darkness_var.get())
-            quantity = int(self.quantity_var.get())
+            # Get settings from UI (IntVar.get() already returns int)
+            threshold = self.threshold_var.get()
+            position_x = self.pos_x_var.get()
+            position_y = self.pos_y_var.get()
+            print_speed = self.speed_var.get()
+            darkness = self.darkness_var.get()
+            quantity = self.quantity_var.get()
             pw, ll = self.label_sizes[self.label_size_var.get()]
             self.printer_name = self.printer_var.get()
             
-            # Open and convert image
-            img = self.pil_image.copy()
-            
-            # Convert to black and white
-            if img.mode != '1':
-                # Convert to grayscale first if needed
-                if img.mode != 'L':
-                    img = img.convert('L')
-                
-                # Convert to 1-bit with threshold (inverted for ZPL)
-                img = img.point(lambda x: 0 if x >= threshold else 255, mode='1')
-            
-            # Get dimensions
-            width, height = img.size
-            
-            # Calculate bytes per row (rounded up to nearest byte)
-            bytes_per_row = (width + 7) // 8
-            
-            # Get the binary data
-            binary_data = img.tobytes()
-            
-            # Convert binary data to hex
-            hex_rows = []
-            for i in range(0, len(binary_data), bytes_per_row):
-                row = binary_data[i:i+bytes_per_row]
-                hex_row = ''.join(f'{byte:02X}' for byte in row)
-                hex_rows.append(hex_row)
+            # Get the ^GFA graphic data, reused across repeated prints
+            hex_data, width, height, bytes_per_row, total_bytes = self.get_graphic_data(threshold)
             
-            # Join all rows with newlines
-            hex_data = '\n'.join(hex_rows)
+            # Create ZPL code with quality settings
+            # Kept as parts so the large hex data is never copied into one string
+            zpl_parts = [
+                "^XA\n",
+                f"^PW{pw}\n^LL{ll}\n",           # Label width and length
+                f"^PR{print_speed},0,0\n",       # Print speed
+                f"^MD{darkness}\n",              # Darkness/Intensity
+                f"^PQ{quantity}\n",              # Quantity
+                f"^FO{position_x},{position_y}\n",
+                f"^GFA,{total_bytes},{total_bytes},{bytes_per_row},\n",
+                hex_data,
+                "\n^FS\n^XZ",
+            ]
             
-            # Calculate total bytes
-            total_bytes = bytes_per_row * height
-            
-            # Create ZPL code with quality settings - ensure all values are integers
-            zpl = f"^XA\n"
-            zpl += f"^PW{pw}\n^LL{ll}\n"           # Label width and length
-            zpl += f"^PR{int(print_speed)},0,0\n"  # Print speed
-            zpl += f"^MD{int(darkness)}\n"         # Darkness/Intensity
-            zpl += f"^PQ{int(quantity)}\n"         # Quantity
-            zpl += f"^FO{int(position_x)},{int(position_y)}\n"
-            zpl += f"^GFA,{total_bytes},{total_bytes},{bytes_per_row},\n{hex_data}\n"
-            zpl += "^FS\n^XZ"
-            
-            # Create a temporary file
-            temp_file = "temp_print.zpl"
-            with open(temp_file, 'w') as f:
-                f.write(zpl)
-            
-            # Print using lp command
-            cmd = ["lp", "-d", self.printer_name, "-o", "raw", temp_file]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Print using lp command, streaming the ZPL through stdin
+            cmd = ["lp", "-d", self.printer_name, "-o", "raw"]
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True)
+            try:
+                proc.stdin.writelines(zpl_parts)
+            except BrokenPipeError:
+                pass  # lp exited early, its stderr explains why
+            _, stderr = proc.communicate()
             
-            if result.returncode == 0:
+            if proc.returncode == 0:
                 self.status_var.set(f"Print job sent successfully")
                 messagebox.showinfo("Print Job", f"Print job sent successfully to {self.printer_name}")
                 
@@ -528,15 +618,9 @@ class ZPLPrinterApp:
                 
                 messagebox.showinfo("Print Details", info_message)
             else:
-                error_msg = f"Error sending print job: {result.stderr}"
+                error_msg = f"Error sending print job: {stderr}"
                 self.status_var.set(error_msg)
                 messagebox.showerror("Print Error", error_msg)
-            
-            # Clean up
-            try:
-                os.remove(temp_file)
-            except:
-                pass
         
         except Exception as e:
             error_msg = f"Error: {e}"